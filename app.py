@@ -1,25 +1,32 @@
 import streamlit as st
 import traceback
 import pandas as pd
+import numpy as np
 import streamlit.components.v1 as components
-import json
+import re
+import time
+import html
+import bisect
+import functools
+import operator
+import unicodedata
+import ssl
+import base64
+import datetime
+from pathlib import Path
 
 # APP VERSION
 APP_VERSION = "v2.2.2"
 
 
 try:
-    import pandas as pd
+    # Third-party connectors only; stdlib and core imports live at the top of the module
     from streamlit_gsheets import GSheetsConnection
-    import streamlit.components.v1 as components
-    import unicodedata
-    import ssl
-    import pykakasi
-    import json # Added for passing data to JS
     from google.oauth2 import service_account
     from googleapiclient.discovery import build
     from googleapiclient.http import MediaIoBaseUpload
-    import io
+    import requests
+    from st_keyup import st_keyup
 
     # Fix for SSL: CERTIFICATE_VERIFY_FAILED on macOS
     # (Force rebuild trigger: 2026-01-29)
@@ -44,6 +51,29 @@ except Exception as e:
 
 # Continue with main app logic only if imports succeed
 
+# -----------------------------------------------------------------------------
+# Precompiled Patterns (compiled once at import, never inside loops)
+# -----------------------------------------------------------------------------
+# Regex to capture the 11-char YouTube ID
+_YT_RE = re.compile(r'(?:v=|\/|be\/|embed\/)([0-9A-Za-z_-]{11})')
+
+# Memo tokenizer: split by space, comma, dot, newlines
+_TOKEN_RE = re.compile(r'[\s,、。]+')
+
+# Line boundaries recognised by str.splitlines(); a single trailing break adds no line
+_LINE_BREAK_RE = re.compile(r'\r\n|[\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]')
+_TRAILING_LINE_BREAK_RE = re.compile(r'(?:\r\n|[\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029])\Z')
+
+# Drive images (thumbnail links and GAS "uc?export=view" links) are re-requested at card
+# width instead of full size; the card slot is only ~320px wide
+DRIVE_THUMB_WIDTH = 320
+_DRIVE_IMAGE_RE = re.compile(r'^https://drive\.google\.com/(?:thumbnail\?id=|uc\?export=view&id=)([\w-]+).*$')
+
+# Names written only in kana need no dictionary lookup: folding hiragana to katakana
+# gives the same reading kakasi would (and katakana sorts in gojyuon order by codepoint)
+_KANA_ONLY_RE = re.compile(r'[\u3040-\u30ff\s]+')
+_HIRA_TO_KATA = str.maketrans({chr(c): chr(c + 0x60) for c in range(0x3041, 0x3097)})
+
 # -----------------------------------------------------------------------------
 # Page Configuration & CSS
 # -----------------------------------------------------------------------------
@@ -55,7 +85,7 @@ st.set_page_config(
 )
 
 # Custom CSS for that extra "wow" factor
-st.markdown("""
+_STATIC_CSS = """
 <style>
     /* Global Styles */
     .stApp {
@@ -95,6 +125,13 @@ st.markdown("""
         background-color: #000 !important; /* Black background for letterboxing */
     }
     
+    .dance-thumb {
+        width: 100%;
+        height: 200px;
+        overflow: hidden;
+        position: relative;
+    }
+
     /* Card Content */
     .dance-card-content {
         padding: 12px;
@@ -126,6 +163,33 @@ st.markdown("""
         color: #E1BEE7;
     }
 
+    .platform-badge {
+        font-size: 0.75rem;
+        background: #CC0000;
+    }
+
+    .dance-memo {
+        font-size: 0.8rem;
+        color: #aaa;
+        margin-bottom: 4px;
+        line-height: 1.2;
+        white-space: nowrap;
+        overflow: hidden;
+        text-overflow: ellipsis;
+    }
+
+    /* Batched Grid (View Mode) */
+    .video-grid {
+        display: grid;
+        grid-template-columns: repeat(3, minmax(0, 1fr));
+        gap: 0 1rem;
+    }
+    @media (max-width: 640px) {
+        .video-grid {
+            grid-template-columns: minmax(0, 1fr);
+        }
+    }
+
     /* Link behavior */
     a.card-link {
         text-decoration: none;
@@ -139,7 +203,98 @@ st.markdown("""
 
 
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# Custom CSS to Fix Position to Top-Left Header (Next to Toggle)
+_VIEW_MODE_CSS = """
+<style>
+    /* Position the Radio Container in the Header area */
+    div[data-testid="stRadio"] {
+        position: fixed !important;
+        top: 18px !important; /* Align with the sidebar toggle */
+        left: 70px !important; /* To the right of the toggle */
+        z-index: 1000000 !important;
+        width: auto !important;
+        background-color: transparent !important;
+        border: none !important;
+        padding: 0 !important;
+    }
+    
+    /* Horizontal layout */
+    div[role="radiogroup"] {
+        display: flex;
+        flex-direction: row;
+        gap: 15px;
+    }
+
+    /* Hide the default radio circle */
+    div[data-testid="stRadio"] label > div:first-child {
+        display: none;
+    }
+
+    /* Style the labels to look like text links */
+    div[data-testid="stRadio"] label {
+        background-color: transparent !important;
+        border: none !important;
+        color: #888 !important; /* Inactive color */
+        font-weight: 600;
+        cursor: pointer;
+        padding: 0 !important;
+        margin: 0 !important;
+        transition: color 0.2s;
+        font-size: 1rem;
+    }
+    
+    /* Hover state */
+    div[data-testid="stRadio"] label:hover {
+        color: #fff !important;
+    }
+
+    /* Selected State (Underline) */
+    div[data-testid="stRadio"] label:has(input:checked) {
+        border-bottom: 2px solid #FF8C00 !important;
+        color: white !important;
+    }
+    
+    /* Robust "Selected" styling is hard without stable classes. 
+       Let's just make them look good. 
+       We can assume the user knows which is active by the view.
+       But let's try to target the active one.
+       Usually the active radio has aria-checked="true" on the input.
+    */
+
+    /* Button Styles (Primary -> Orange) */
+    div.stButton > button[kind="primary"] {
+        background-color: #FF8C00 !important;
+        border-color: #FF8C00 !important;
+        color: white !important;
+    }
+    div.stButton > button[kind="primary"]:hover {
+        background-color: #E67E00 !important;
+        border-color: #E67E00 !important;
+    }
+
+    /* Footer */
+    .footer {
+        position: fixed;
+        left: 0;
+        bottom: 0;
+        width: 100%;
+        background-color: #0E1117;
+        color: #888;
+        text-align: center;
+        padding: 10px;
+        font-size: 0.8rem;
+        border-top: 1px solid #333;
+        z-index: 999;
+    }
+
+</style>
+"""
+
+# Both static style blocks go out in a single element. It is re-sent every rerun on purpose:
+# Streamlit drops elements a rerun does not emit, so a "once per session" guard would unstyle the page.
+st.markdown(_STATIC_CSS + _VIEW_MODE_CSS, unsafe_allow_html=True)
 
 # -----------------------------------------------------------------------------
 # Data Loading
@@ -147,17 +302,117 @@ st.markdown("""
 # Public Google Sheet URL provided by user
 SPREADSHEET_URL = "https://docs.google.com/spreadsheets/d/1szdhHLrIHF_uMDjIOJokPGsxm_7BbvhiT9iKxrYxtH8/edit?usp=drive_link"
 
-@st.cache_data(ttl=600)
+# Discipline Custom Order (W, T, F, Q, V, Other); anything else sorts after
+discipline_order = {'W': 0, 'T': 1, 'F': 2, 'Q': 3, 'V': 4, 'Other': 5}
+
+def discipline_sort_key(discipline):
+    return discipline_order.get(discipline, 99), str(discipline)
+
+# Auto-thumbnail helper
+def get_thumbnail_url(video_url):
+    if not video_url:
+        return ""
+    match = _YT_RE.search(video_url)
+    if match:
+        video_id = match.group(1)
+        return f"https://img.youtube.com/vi/{video_id}/hqdefault.jpg"
+    return ""
+
+@st.cache_resource
+def get_conn():
+    """Returns the shared GSheets connection (HTTP client reused across reruns)."""
+    return st.connection("gsheets", type=GSheetsConnection)
+
+# Local snapshot of the last sheet read (second cache tier, survives restarts and cache clears)
+# (versioned: bump the name whenever the snapshot's layout or index meaning changes)
+SHEET_SNAPSHOT_PATH = Path.home() / ".cache" / "videoapp" / "sheet-v2.pkl"
+SHEET_SNAPSHOT_TTL = 600 # seconds
+
+# Columns read from the sheet: A ダンサー, B 種目, C platform, D 画像URL, E 動画URL, F メモ
+SHEET_COLUMN_COUNT = 6
+# The frame is indexed by each record's sheet row number
+SHEET_ROW_INDEX_NAME = "sheet_row"
+
+def data_fingerprint(data):
+    """Lightweight content hash of a frame (row count + summed row hashes)."""
+    return (len(data), int(pd.util.hash_pandas_object(data, index=True).sum()))
+
+def label_sheet_rows(data):
+    """Re-labels a freshly read frame by sheet row (row 1 is the header) and drops blank records.
+    Both readers keep each record's positional label (0 = first row under the header), also
+    across rows they drop themselves (gspread_dataframe's drop_empty_rows); the CSV reader
+    keeps blank rows as NaN rows (skip_blank_lines=False). So label + 2 is the sheet row,
+    whereas renumbering the surviving rows would shift every record below a gap."""
+    data = data.set_axis(pd.Index(data.index + 2, name=SHEET_ROW_INDEX_NAME), axis=0)
+    return data.dropna(how='all')
+
+@st.cache_data(ttl=600, max_entries=1, show_spinner=False)
 def load_data():
-    conn = st.connection("gsheets", type=GSheetsConnection)
+    # Serve the local snapshot while it is fresh (skips the network round-trip)
     try:
-        data = conn.read(spreadsheet=SPREADSHEET_URL)
+        if SHEET_SNAPSHOT_PATH.exists() and time.time() - SHEET_SNAPSHOT_PATH.stat().st_mtime < SHEET_SNAPSHOT_TTL:
+            snapshot = pd.read_pickle(SHEET_SNAPSHOT_PATH)
+            # Older snapshots are indexed 0..n-1 rather than by sheet row: re-read those
+            if snapshot.index.name == SHEET_ROW_INDEX_NAME:
+                return snapshot
+    except Exception:
+        pass # Corrupt/unreadable snapshot: fall back to the sheet
+
+    conn = get_conn()
+    try:
+        # ttl=0: conn.read has its own 1h cache, which invalidate_data_cache() can't reach;
+        # load_data is the only cache layer, so a Reload/write really re-reads the sheet
+        try:
+            # Only columns A-F are used; skip anything to the right of them
+            data = conn.read(spreadsheet=SPREADSHEET_URL, ttl=0, usecols=list(range(SHEET_COLUMN_COUNT)), skip_blank_lines=False)
+        except ValueError:
+            # Sheet is narrower than A-F: read what is there
+            data = conn.read(spreadsheet=SPREADSHEET_URL, ttl=0, skip_blank_lines=False)
+        data.columns = data.columns.str.strip()
+        # Index = real sheet row, so targeted edits/deletes stay on the right row when the sheet has gaps
+        data = label_sheet_rows(data)
+        # Clean the memo text once per load instead of on every rerun
+        if 'メモ' in data.columns:
+            data['メモ'] = data['メモ'].fillna("").astype(str)
+        # Factorize the filter columns once so isin() tests int codes instead of strings
+        if 'ダンサー' in data.columns:
+            data['ダンサー'] = data['ダンサー'].astype('category')
+        if '種目' in data.columns:
+            # Ordered by the discipline custom order, so sorting uses the int8 codes
+            disciplines = sorted(data['種目'].dropna().unique(), key=discipline_sort_key)
+            data['種目'] = pd.Categorical(data['種目'], categories=disciplines, ordered=True)
+        # Downcast any numeric columns (sheet numbers arrive as int64/float64)
+        for col in data.select_dtypes(include='integer').columns:
+            data[col] = pd.to_numeric(data[col], downcast='integer')
+        for col in data.select_dtypes(include='floating').columns:
+            data[col] = pd.to_numeric(data[col], downcast='float')
+        # Fingerprint once per load; reruns reuse it as the key for derived caches
+        data.attrs['fingerprint'] = data_fingerprint(data)
+        try:
+            SHEET_SNAPSHOT_PATH.parent.mkdir(parents=True, exist_ok=True)
+            data.to_pickle(SHEET_SNAPSHOT_PATH)
+        except Exception:
+            pass # Snapshot is best-effort
         return data
     except Exception as e:
         st.error(f"Error loading data: {e}")
         st.info("If you see an authentication error, please ensure your Google Sheet is set to 'Anyone with the link' -> 'Viewer'.")
         return pd.DataFrame()
 
+def invalidate_data_cache():
+    """Drops the loaded sheet (in-memory and the local snapshot) so the next run re-reads it.
+    Only load_data is cleared: the derived caches are keyed on the data fingerprint and
+    simply miss when the re-read data differs."""
+    load_data.clear()
+    try:
+        SHEET_SNAPSHOT_PATH.unlink()
+    except FileNotFoundError:
+        pass
+    # This session's facet lists and dancer grouping are rebuilt outright
+    # (not left to a fingerprint comparison), and the header row is re-read for writes
+    for key in ("_facets_fp", "_dancer_groups_fp", "_sheet_columns"):
+        st.session_state.pop(key, None)
+
 df = load_data()
 
 # Check if dataframe is empty
@@ -187,6 +442,30 @@ if 'メモ' not in df.columns:
 # -----------------------------------------------------------------------------
 # Folder ID from GAS script
 DRIVE_FOLDER_ID = "13fNsuwfvL3TKTawp8XlXM_fuPu63F1-d"
+# Resumable upload chunk size (must be a multiple of 256 KB)
+DRIVE_UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+def get_drive_service():
+    """Returns this session's Drive API client (built once per session, not shared:
+    the client's httplib2 transport is not thread-safe across session threads)."""
+    if "_drive_service" not in st.session_state:
+        conn_secrets = st.secrets["connections"]["gsheets"]
+        creds = service_account.Credentials.from_service_account_info(
+            conn_secrets,
+            scopes=["https://www.googleapis.com/auth/drive.file"]
+        )
+        st.session_state["_drive_service"] = build('drive', 'v3', credentials=creds)
+    return st.session_state["_drive_service"]
+
+def get_http_session():
+    """Returns this session's requests.Session (keeps the TLS connection to the GAS proxy alive).
+    Per session rather than cache_resource: requests doesn't guarantee a Session is thread-safe."""
+    if "_http_session" not in st.session_state:
+        st.session_state["_http_session"] = requests.Session()
+    return st.session_state["_http_session"]
+
+# Upper bound for one proxy POST (Apps Script itself gives up after ~6 minutes)
+GAS_UPLOAD_TIMEOUT = 120 # seconds
 
 def upload_image_to_drive(file_obj, filename, folder_id=None):
     """Uploads a file object to Google Drive (via API or GAS Proxy) and returns the direct link."""
@@ -200,13 +479,9 @@ def upload_image_to_drive(file_obj, filename, folder_id=None):
         
         if gas_url:
             # OPTION B: GAS PROXY UPLOAD
-            import requests
-            import base64
-            
-            # Read file and encode
-            file_content = file_obj.read()
-            encoded_content = base64.b64encode(file_content).decode('utf-8')
-            file_obj.seek(0) # Reset pointer
+            # Encode straight from the upload buffer (no intermediate raw copy, pointer untouched)
+            # Apps Script can't parse multipart bodies, so the proxy still takes base64 form data
+            encoded_content = base64.b64encode(file_obj.getbuffer()).decode('ascii')
             
             # Use provided folder ID or fallback
             target_folder = folder_id if folder_id else DRIVE_FOLDER_ID
@@ -218,7 +493,7 @@ def upload_image_to_drive(file_obj, filename, folder_id=None):
                 'file_content': encoded_content
             }
             
-            response = requests.post(gas_url, data=payload)
+            response = get_http_session().post(gas_url, data=payload, timeout=GAS_UPLOAD_TIMEOUT)
             try:
                 result = response.json()
             except Exception:
@@ -236,14 +511,7 @@ def upload_image_to_drive(file_obj, filename, folder_id=None):
         # OPTION A: DIRECT SERVICE ACCOUNT UPLOAD (Existing Logic)
         # ... (rest of function)
 
-        # Load credentials from secrets
-        conn_secrets = st.secrets["connections"]["gsheets"]
-        creds = service_account.Credentials.from_service_account_info(
-            conn_secrets,
-            scopes=["https://www.googleapis.com/auth/drive.file"]
-        )
-        
-        service = build('drive', 'v3', credentials=creds)
+        service = get_drive_service()
         
         # Use provided folder ID or fallback to global default (if valid)
         target_folder = folder_id if folder_id else DRIVE_FOLDER_ID
@@ -253,14 +521,23 @@ def upload_image_to_drive(file_obj, filename, folder_id=None):
             'parents': [target_folder]
         }
         
-        media = MediaIoBaseUpload(file_obj, mimetype=file_obj.type, resumable=True)
+        media = MediaIoBaseUpload(file_obj, mimetype=file_obj.type, chunksize=DRIVE_UPLOAD_CHUNK_SIZE, resumable=True)
         
-        file = service.files().create(
+        request = service.files().create(
             body=file_metadata,
             media_body=media,
             fields='id',
             supportsAllDrives=True
-        ).execute()
+        )
+        
+        # Send in chunks, reporting progress as each one lands
+        progress_bar = st.progress(0.0)
+        file = None
+        while file is None:
+            status, file = request.next_chunk()
+            if status:
+                progress_bar.progress(status.progress())
+        progress_bar.empty()
         
         file_id = file.get('id')
         
@@ -271,7 +548,7 @@ def upload_image_to_drive(file_obj, filename, folder_id=None):
         ).execute()
         
         # Return the thumbnail link
-        return f"https://drive.google.com/thumbnail?id={file_id}&sz=w1000"
+        return f"https://drive.google.com/thumbnail?id={file_id}&sz=w{DRIVE_THUMB_WIDTH}"
         
     except Exception as e:
         error_msg = str(e)
@@ -296,14 +573,136 @@ if len(df.columns) >= 3:
 else:
     df['platform'] = "YouTube" # Default fallback
 
-df['メモ'] = df['メモ'].fillna("").astype(str)
-df['platform'] = df['platform'].fillna("YouTube").astype(str)
+# Only a handful of site names: keep them as a category like the other filter columns
+df['platform'] = df['platform'].fillna("YouTube").astype(str).astype('category')
+
+# -----------------------------------------------------------------------------
+# Google Sheets Write Helpers (targeted ranges, not full-sheet rewrites)
+# -----------------------------------------------------------------------------
+SPREADSHEET_ID = SPREADSHEET_URL.split("/d/")[1].split("/")[0]
+
+def get_sheets_service():
+    """Returns this session's Sheets API client using the gsheets service account.
+    Kept per session, not in cache_resource: the client's httplib2 transport is not
+    thread-safe, and every session runs its script in its own thread."""
+    if "_sheets_service" not in st.session_state:
+        conn_secrets = st.secrets["connections"]["gsheets"]
+        creds = service_account.Credentials.from_service_account_info(
+            conn_secrets,
+            scopes=["https://www.googleapis.com/auth/spreadsheets"]
+        )
+        st.session_state["_sheets_service"] = build('sheets', 'v4', credentials=creds)
+    return st.session_state["_sheets_service"]
+
+@st.cache_resource
+def get_sheet_properties():
+    """Returns the sheetId/title of the first worksheet (the one conn.read uses)."""
+    meta = get_sheets_service().spreadsheets().get(
+        spreadsheetId=SPREADSHEET_ID,
+        fields="sheets.properties(sheetId,title)"
+    ).execute()
+    return meta["sheets"][0]["properties"]
+
+def get_sheet_columns():
+    """Maps each column name used by the app to its 0-based sheet column, from the sheet's own
+    header row. df positions can't be used: the reader drops empty unnamed columns, which
+    shifts every later column. Cached per session, dropped by invalidate_data_cache()."""
+    if "_sheet_columns" not in st.session_state:
+        props = get_sheet_properties()
+        result = get_sheets_service().spreadsheets().values().get(
+            spreadsheetId=SPREADSHEET_ID,
+            range=f"'{props['title']}'!1:1"
+        ).execute()
+        header = [str(name).strip() for name in (result.get("values") or [[]])[0]]
+        positions = {name: pos for pos, name in reversed(list(enumerate(header))) if name}
+        # Columns C and F are renamed to 'platform' / 'メモ' after loading, whatever their header says
+        if len(header) >= 3:
+            positions['platform'] = 2
+        if len(header) >= 6:
+            positions['メモ'] = 5
+        st.session_state["_sheet_columns"] = positions
+    return st.session_state["_sheet_columns"]
+
+def sheet_row_number(index):
+    # The index label is the sheet row itself (set in load_data, blank rows accounted for)
+    return int(index)
+
+def column_letter(position):
+    """0-based column position -> A1 column letter (0 -> A, 26 -> AA)."""
+    letters = ""
+    position += 1
+    while position:
+        position, rem = divmod(position - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+def update_sheet_row(index, values):
+    """Writes only the given {column name: value} cells of one row."""
+    props = get_sheet_properties()
+    columns = get_sheet_columns()
+    row_num = sheet_row_number(index)
+    data = [
+        {"range": f"'{props['title']}'!{column_letter(columns[col])}{row_num}", "values": [[value]]}
+        for col, value in values.items()
+    ]
+    get_sheets_service().spreadsheets().values().batchUpdate(
+        spreadsheetId=SPREADSHEET_ID,
+        body={"valueInputOption": "USER_ENTERED", "data": data}
+    ).execute()
+
+def append_sheet_row(values):
+    """Appends one row, laid out in sheet column order; unset columns are left blank."""
+    props = get_sheet_properties()
+    columns = get_sheet_columns()
+    row = [""] * (max(columns.values(), default=-1) + 1)
+    for col, value in values.items():
+        if col in columns:
+            row[columns[col]] = value
+    get_sheets_service().spreadsheets().values().append(
+        spreadsheetId=SPREADSHEET_ID,
+        range=f"'{props['title']}'!A1",
+        valueInputOption="USER_ENTERED",
+        insertDataOption="INSERT_ROWS",
+        body={"values": [row]}
+    ).execute()
+
+def delete_sheet_row(index):
+    """Deletes a single row from the sheet."""
+    props = get_sheet_properties()
+    row_num = sheet_row_number(index)
+    get_sheets_service().spreadsheets().batchUpdate(
+        spreadsheetId=SPREADSHEET_ID,
+        body={"requests": [{"deleteDimension": {"range": {
+            "sheetId": props["sheetId"],
+            "dimension": "ROWS",
+            "startIndex": row_num - 1,
+            "endIndex": row_num
+        }}}]}
+    ).execute()
 
 # ==========================================
 # 5. ALPHABET INDEX (Global Helper) v2.1.1
 # ==========================================
 
+# Hepburn initial of every kana (hiragana listed; katakana is the same codepoint + 0x60)
+# so kana-initial names are bucketed by a table lookup instead of a kakasi conversion
+_KANA_INITIAL_ROWS = {
+    'A': 'あぁ', 'I': 'いぃゐ', 'U': 'うぅ', 'E': 'えぇゑ', 'O': 'おぉを',
+    'K': 'かきくけこゕゖ', 'G': 'がぎぐげご',
+    'S': 'さしすせそ', 'Z': 'ざずぜぞづ', 'J': 'じぢ',
+    'T': 'たつてと', 'C': 'ち', 'D': 'だでど',
+    'N': 'なにぬねのん', 'H': 'はひへほ', 'F': 'ふ', 'B': 'ばびぶべぼ', 'P': 'ぱぴぷぺぽ',
+    'M': 'まみむめも', 'Y': 'やゆよゃゅょ', 'R': 'らりるれろ', 'W': 'わゎ', 'V': 'ゔ',
+}
+_KANA_INITIAL = {}
+for _initial, _chars in _KANA_INITIAL_ROWS.items():
+    for _c in _chars:
+        _KANA_INITIAL[ord(_c)] = _initial
+        _KANA_INITIAL[ord(_c) + 0x60] = _initial
+
 # v2.2.0 HELPER: Get Initial from Text
+# Memoized: dancer names repeat across rows and reruns
+@functools.lru_cache(maxsize=4096)
 def get_initial_from_text(text):
     """Extracts the first letter (initial) from text, converting Kanji to Romaji if needed."""
     if not text: return "?"
@@ -312,12 +711,19 @@ def get_initial_from_text(text):
     text = str(text)
     if not text: return "?"
 
-    # 1. Try PyKakasi (Japanese)
+    # 1. ASCII: the character itself (digits/symbols go under '#')
+    first_char = text[0]
+    if first_char.isascii():
+        return first_char.upper() if first_char.isalpha() else "#"
+
+    # 2. Kana: only the first character's reading matters, so use the table
+    initial = _KANA_INITIAL.get(ord(first_char))
+    if initial:
+        return initial
+
+    # 3. Try PyKakasi (Kanji and anything else)
     try:
-        kks = kakasi() 
-        # Note: Initializing kakasi every time might be slow. 
-        # Ideally move global, but Streamlit caching handles execution flow well enough.
-        result = kks.convert(text)
+        result = get_kakasi().convert(text)
         if result:
             romaji = result[0]['hepburn']
             if romaji:
@@ -326,8 +732,8 @@ def get_initial_from_text(text):
                     return initial
                 else:
                     return "#" # Symbol
-    except:
-            pass
+    except Exception:
+        pass
     
     # Fallback
     try:
@@ -339,20 +745,10 @@ def get_initial_from_text(text):
         
     return "#"
 
-# Define reusable function for Slide Index
-def render_slide_index(items):
-    """
-    Renders a fixed-position right-side index bar with slide-to-scroll support.
-    Args:
-        items: List of strings (keys) to display in the index.
-               The anchors must be id='anchor-{item}'
-    """
-    if not items: return
-
-    # CSS for the Index Bar (Glassmorphism)
-    index_bar_css = f"""
+# Index bar styles (Glassmorphism): a plain constant, no f-string brace escaping
+SLIDE_INDEX_CSS = """
     <style>
-        .alphabet-index {{
+        .alphabet-index {
             position: fixed;
             right: 10px; 
             top: 55%;
@@ -371,11 +767,11 @@ def render_slide_index(items):
             -ms-overflow-style: none;
             scrollbar-width: none;
             touch-action: none !important; /* Prevent default touch scrolling */
-        }}
-        .alphabet-index::-webkit-scrollbar {{
+        }
+        .alphabet-index::-webkit-scrollbar {
             display: none;
-        }}
-        .index-char {{
+        }
+        .index-char {
             display: flex;
             align-items: center;
             justify-content: center;
@@ -391,31 +787,29 @@ def render_slide_index(items):
             width: 100%;
             height: 24px; /* Fixed height for consistency */
             transition: all 0.1s ease;
-        }}
-        .index-char:hover {{
+        }
+        .index-char:hover {
              color: white;
              transform: scale(1.1);
-        }}
-        .index-char.active {{
+        }
+        .index-char.active {
             background-color: #FF8C00; /* Premium Orange */
             color: white !important;
             transform: scale(1.4);
             border-radius: 50%;
             box-shadow: 0 0 10px rgba(255, 140, 0, 0.5);
             font-weight: bold;
-        }}
+        }
     </style>
-
+"""
+SLIDE_INDEX_BAR_TEMPLATE = """
     <div class="alphabet-index" id="alphabetIndex">
-        {''.join([f'<a class="index-char" href="#anchor-{char}" data-char="{char}">{char if len(char) < 3 else char[:2]}</a>' for char in items])}
+        {items}
     </div>
-    """
-    
-    # Inject HTML/CSS
-    st.markdown(index_bar_css, unsafe_allow_html=True)
-
-    # Inject JavaScript logic via Component (Escapes Iframe Sandbox)
-    components.html("""
+"""
+SLIDE_INDEX_LINK_TEMPLATE = '<a class="index-char" href="#anchor-{char}" data-char="{char}">{label}</a>'
+# Slide-to-scroll logic, run in a component iframe against the parent document
+SLIDE_INDEX_SCRIPT = """
     <script>
         (function() {
             // Target the PARENT document (Main App Window)
@@ -493,7 +887,32 @@ def render_slide_index(items):
             });
         })();
     </script>
-    """, height=0, width=0)
+    """
+
+@functools.lru_cache(maxsize=32)
+def build_index_bar_html(items):
+    """Builds the index bar HTML/CSS for a tuple of keys (cached: the bar only changes with the keys)."""
+    links = "".join(
+        SLIDE_INDEX_LINK_TEMPLATE.format_map({'char': char, 'label': char if len(char) < 3 else char[:2]})
+        for char in items
+    )
+    return SLIDE_INDEX_CSS + SLIDE_INDEX_BAR_TEMPLATE.format_map({'items': links})
+
+# Define reusable function for Slide Index
+def render_slide_index(items):
+    """
+    Renders a fixed-position right-side index bar with slide-to-scroll support.
+    Args:
+        items: List of strings (keys) to display in the index.
+               The anchors must be id='anchor-{item}'
+    """
+    if not items: return
+
+    # Inject HTML/CSS (built once per distinct set of keys)
+    st.markdown(build_index_bar_html(tuple(items)), unsafe_allow_html=True)
+
+    # Inject JavaScript logic via Component (Escapes Iframe Sandbox)
+    components.html(SLIDE_INDEX_SCRIPT, height=0, width=0)
 
 # DEBUG: Check Memo Data
 # with st.sidebar.expander("Debug: Data Inspector"):
@@ -513,42 +932,112 @@ st.sidebar.title("Filter Options")
 
 
 
+# Max number of memo tokens offered in the Search multiselect
+SEARCH_VOCAB_LIMIT = 200
+# Max number of matches offered while typing a search query
+SEARCH_SUGGESTION_LIMIT = 50
+
+def vocab_matches(vocab_index, query, limit=SEARCH_SUGGESTION_LIMIT):
+    """Returns up to `limit` vocab words containing query, case-insensitively.
+    vocab_index is (lower-cased words sorted, original words in the same order):
+    prefix matches come first via binary search, substring matches fill the rest."""
+    keys, words = vocab_index
+    query = query.lower()
+    start = bisect.bisect_left(keys, query)
+    matches = [w for k, w in zip(keys[start:start + limit], words[start:start + limit]) if k.startswith(query)]
+    if len(matches) < limit:
+        # Substring fallback (same semantics as the multiselect's own filtering)
+        for k, w in zip(keys, words):
+            if query in k and not k.startswith(query):
+                matches.append(w)
+                if len(matches) >= limit:
+                    break
+    return matches
+
+@st.cache_data(ttl=600, max_entries=1)
+def build_vocab(memo_hash, _memo_series):
+    """Builds the memo vocabulary (all tokens, and the most frequent ones).
+    Keyed on the memo column's hash only, so edits to other columns don't re-tokenize."""
+    # Simple tokenization: split by space, full-width space, commas
+    # Japanese text might need more complex tokenization (e.g. MeCab) for perfect results,
+    # but simple splitting works for "tags" or space-separated keywords.
+    # Split the whole column at once (pandas string kernels) instead of a per-row loop.
+    memo_tokens = _memo_series.str.split(_TOKEN_RE).explode().dropna()
+    memo_tokens = memo_tokens[memo_tokens != ""]
+    vocab = sorted(memo_tokens.unique().tolist())
+    # Most frequent tokens only, for the Search multiselect (large option lists make it sluggish)
+    top_vocab = sorted(memo_tokens.value_counts().index[:SEARCH_VOCAB_LIMIT])
+    # Lower-cased search index for the case-insensitive query matching
+    pairs = sorted((w.lower(), w) for w in vocab)
+    vocab_index = ([k for k, _ in pairs], [w for _, w in pairs])
+    return vocab, vocab_index, top_vocab
+
+@st.cache_data(ttl=600)
+def compute_facets(df_hash, _dancer_series, _discipline_series, _memo_series):
+    """Builds the filter option lists (dancers, disciplines, memo vocabulary).
+    Keyed on df_hash only, so the series themselves are not re-hashed every rerun."""
+    dancers = sorted(_dancer_series.dropna().unique())
+    if isinstance(_discipline_series.dtype, pd.CategoricalDtype) and _discipline_series.cat.ordered:
+        # Categories are already in the custom order
+        disciplines = list(_discipline_series.cat.remove_unused_categories().cat.categories)
+    else:
+        disciplines = sorted(_discipline_series.dropna().unique(), key=discipline_sort_key)
+
+    # Build Vocabulary
+    memo_hash = int(pd.util.hash_pandas_object(_memo_series, index=False).sum())
+    vocab, vocab_index, top_vocab = build_vocab(memo_hash, _memo_series)
+    # Lower-cased once here so the registration suggestions don't re-lower per keystroke
+    dancers_lower = [str(d).lower() for d in dancers]
+    return dancers, dancers_lower, disciplines, vocab, vocab_index, top_vocab
+
+# Fingerprint of the sheet contents (computed in load_data), used as the key for derived caches
+df_hash = df.attrs.get('fingerprint') or data_fingerprint(df)
+# Reuse this session's option lists while the data fingerprint is unchanged (skips even the cache lookup)
+if st.session_state.get("_facets_fp") != df_hash:
+    st.session_state["_facets"] = compute_facets(df_hash, df['ダンサー'], df['種目'], df['メモ'])
+    st.session_state["_facets_fp"] = df_hash
+all_dancers, all_dancers_lower, all_disciplines, sorted_vocab, vocab_index, top_vocab = st.session_state["_facets"]
+
 # Dancer Filter
-all_dancers = sorted(df['ダンサー'].dropna().unique())
 selected_dancers = st.sidebar.multiselect("Dancer", all_dancers, key="filter_dancer")
 
-# Discipline Filter with Custom Order (W, T, F, Q, V, Other)
-raw_disciplines = df['種目'].dropna().unique()
-discipline_order = {'W': 0, 'T': 1, 'F': 2, 'Q': 3, 'V': 4, 'Other': 5}
-all_disciplines = sorted(raw_disciplines, key=lambda x: discipline_order.get(x, 99))
-
 selected_disciplines = st.sidebar.multiselect("Dance", all_disciplines, key="filter_discipline")
 
 # Free Word Search with Suggestions (from Memo)
-# Build Vocabulary
-unique_words = set()
-for memo in df['メモ']:
-    # Simple tokenization: split by space, full-width space, commas
-    # Japanese text might need more complex tokenization (e.g. MeCab) for perfect results,
-    # but simple splitting works for "tags" or space-separated keywords.
-    # We will just split by standard separators for now.
-    import re
-    # Split by space, comma, dot, newlines
-    tokens = re.split(r'[\s,、。]+', memo)
-    unique_words.update([t for t in tokens if t])
+# Only a small candidate list reaches the browser: case-insensitive matches for the typed query,
+# or the most frequent tokens when the query is empty
+# (the key carries a generation number so "Home / Reset" can remount the box empty)
+with st.sidebar:
+    search_query = st_keyup(
+        "Search",
+        key=f"filter_search_query_{st.session_state.get('filter_search_query_gen', 0)}",
+        placeholder="Type to find keywords...",
+        debounce=300
+    )
+if search_query:
+    search_candidates = vocab_matches(vocab_index, search_query)
+else:
+    search_candidates = top_vocab
+# Keep current selections available even if they are not among the candidates
+search_options = sorted(set(search_candidates) | set(st.session_state.get("filter_search", [])))
+search_keywords = st.sidebar.multiselect("Keywords", search_options, key="filter_search", label_visibility="collapsed")
 
-sorted_vocab = sorted(list(unique_words))
-search_keywords = st.sidebar.multiselect("Search", sorted_vocab, key="filter_search")
 
+@st.cache_resource(ttl=600, max_entries=1) # Read-only: shared, not copied per rerun
+def get_memo_lower(df_hash, _memo_series):
+    """Lower-cased memo column for case-insensitive keyword matching."""
+    return _memo_series.str.lower()
 
 # Apply filters
-filtered_df = df.copy()
+# Compose one boolean mask and index once (no upfront df.copy(), no chained re-indexing)
+# Plain NumPy bools: &= skips pandas index alignment on every step
+mask = np.ones(len(df), dtype=bool)
 
 if selected_dancers:
-    filtered_df = filtered_df[filtered_df['ダンサー'].isin(selected_dancers)]
+    mask &= df['ダンサー'].isin(frozenset(selected_dancers)).to_numpy()
 
 if selected_disciplines:
-    filtered_df = filtered_df[filtered_df['種目'].isin(selected_disciplines)]
+    mask &= df['種目'].isin(frozenset(selected_disciplines)).to_numpy()
 
 if search_keywords:
     # Filter: Keep row if ANY of the selected keywords appear in the 'メモ' column
@@ -556,106 +1045,123 @@ if search_keywords:
     #  UNLESS user wants to narrow down. Let's do AND logic for narrowing down)
     
     # AND logic: Row must contain ALL selected keywords
-    for keyword in search_keywords:
-         filtered_df = filtered_df[filtered_df['メモ'].str.contains(keyword, case=False, na=False)]
+    # Lowered column is cached per data load; every keyword folds into a single mask
+    memo_lower = get_memo_lower(df_hash, df['メモ'])
+    mask &= functools.reduce(
+        operator.and_,
+        (memo_lower.str.contains(keyword.lower(), regex=False, na=False).to_numpy() for keyword in search_keywords)
+    )
+
+if selected_dancers or selected_disciplines or search_keywords:
+    filtered_df = df.loc[mask]
+else:
+    filtered_df = df
 
 # -----------------------------------------------------------------------------
 # Registration Form (Sidebar)
 # -----------------------------------------------------------------------------
-from st_keyup import st_keyup
-
 st.sidebar.markdown("---")
-with st.sidebar.expander("➕ Add"):
-    # Dancer Input
-    if "reg_dancer_key_ver" not in st.session_state: st.session_state["reg_dancer_key_ver"] = 0
+# Max number of suggestion pills shown under a registration input
+SUGGESTION_LIMIT = 20
+
+# Fragment: keystrokes in the keyup inputs rerun only this block, not the whole app
+@st.fragment
+def registration_form(all_dancers, all_dancers_lower, sorted_vocab):
+    with st.expander("➕ Add"):
+        # Dancer Input
+        if "reg_dancer_key_ver" not in st.session_state: st.session_state["reg_dancer_key_ver"] = 0
     
-    def apply_dancer_suggestion():
-        if st.session_state.get("reg_dancer_pills"):
-            st.session_state["reg_dancer_value"] = st.session_state.reg_dancer_pills
-            st.session_state["reg_dancer_key_ver"] += 1
+        def apply_dancer_suggestion():
+            if st.session_state.get("reg_dancer_pills"):
+                st.session_state["reg_dancer_value"] = st.session_state.reg_dancer_pills
+                st.session_state["reg_dancer_key_ver"] += 1
 
-    current_dancer_key = f"reg_dancer_keyup_{st.session_state['reg_dancer_key_ver']}"
-    default_dancer_val = st.session_state.get("reg_dancer_value", "")
+        current_dancer_key = f"reg_dancer_keyup_{st.session_state['reg_dancer_key_ver']}"
+        default_dancer_val = st.session_state.get("reg_dancer_value", "")
 
-    dancer_val = st_keyup("Dancer Name", value=default_dancer_val, key=current_dancer_key, placeholder="Ex: Riccardo & Yulia")
+        dancer_val = st_keyup("Dancer Name", value=default_dancer_val, key=current_dancer_key, placeholder="Ex: Riccardo & Yulia")
     
-    matches = []
-    if dancer_val:
-        matches = [d for d in all_dancers if dancer_val.lower() in d.lower()]
-        matches = [m for m in matches if m != dancer_val]
+        matches = []
+        if dancer_val:
+            query = dancer_val.lower()
+            matches = [d for d, d_lower in zip(all_dancers, all_dancers_lower) if query in d_lower and d != dancer_val]
+            matches = matches[:SUGGESTION_LIMIT]
     
-    if matches:
-        st.pills("Suggestions", matches, selection_mode="single", key="reg_dancer_pills", on_change=apply_dancer_suggestion, label_visibility="collapsed")
+        if matches:
+            st.pills("Suggestions", matches, selection_mode="single", key="reg_dancer_pills", on_change=apply_dancer_suggestion, label_visibility="collapsed")
 
-    # Discipline Input
-    new_discipline = st.selectbox("Dance", ['W', 'T', 'F', 'Q', 'V', 'S', 'C', 'R', 'P', 'J', 'Other'])
+        # Discipline Input
+        new_discipline = st.selectbox("Dance", ['W', 'T', 'F', 'Q', 'V', 'S', 'C', 'R', 'P', 'J', 'Other'])
 
-    # Media & Memo
-    # No columns in sidebar to avoid cramping
-    new_img_url = st.text_input("Image URL", placeholder="Empty for auto-YouTube", help="Leave empty to auto-generate")
-    new_video_url = st.text_input("Video URL", placeholder="https://youtu.be/...")
+        # Media & Memo
+        # No columns in sidebar to avoid cramping
+        new_img_url = st.text_input("Image URL", placeholder="Empty for auto-YouTube", help="Leave empty to auto-generate")
+        new_video_url = st.text_input("Video URL", placeholder="https://youtu.be/...")
     
-    # Memo Input
-    if "reg_memo_key_ver" not in st.session_state: st.session_state["reg_memo_key_ver"] = 0
-
-    def apply_memo_suggestion():
-          if st.session_state.get("reg_memo_pills"):
-             old_key = f"reg_memo_keyup_{st.session_state['reg_memo_key_ver']}"
-             current_val = st.session_state.get(old_key, "")
-             added = st.session_state.reg_memo_pills
-             if current_val:
-                 new_val = current_val + " " + added
-             else:
-                 new_val = added
-             st.session_state["reg_memo_value"] = new_val
-             st.session_state["reg_memo_key_ver"] += 1
-
-    current_memo_key = f"reg_memo_keyup_{st.session_state['reg_memo_key_ver']}"
-    default_memo_val = st.session_state.get("reg_memo_value", "")
+        # Memo Input
+        if "reg_memo_key_ver" not in st.session_state: st.session_state["reg_memo_key_ver"] = 0
+
+        def apply_memo_suggestion():
+              if st.session_state.get("reg_memo_pills"):
+                 old_key = f"reg_memo_keyup_{st.session_state['reg_memo_key_ver']}"
+                 current_val = st.session_state.get(old_key, "")
+                 added = st.session_state.reg_memo_pills
+                 if current_val:
+                     new_val = current_val + " " + added
+                 else:
+                     new_val = added
+                 st.session_state["reg_memo_value"] = new_val
+                 st.session_state["reg_memo_key_ver"] += 1
+
+        current_memo_key = f"reg_memo_keyup_{st.session_state['reg_memo_key_ver']}"
+        default_memo_val = st.session_state.get("reg_memo_value", "")
     
-    new_memo = st_keyup("Memo", value=default_memo_val, key=current_memo_key, placeholder="Keywords...")
+        new_memo = st_keyup("Memo", value=default_memo_val, key=current_memo_key, placeholder="Keywords...")
     
-    memo_matches = []
-    if new_memo:
-        tokens = new_memo.split()
-        if tokens:
-            last_token = tokens[-1]
-            memo_matches = [w for w in sorted_vocab if last_token.lower() in w.lower() and last_token != w]
+        memo_matches = []
+        if new_memo:
+            tokens = new_memo.split()
+            if tokens:
+                last_token = tokens[-1]
+                memo_matches = [w for w in sorted_vocab if last_token.lower() in w.lower() and last_token != w]
     
-    if memo_matches:
-         st.pills("Tags", memo_matches, selection_mode="single", key="reg_memo_pills", on_change=apply_memo_suggestion, label_visibility="collapsed")
+        if memo_matches:
+             st.pills("Tags", memo_matches, selection_mode="single", key="reg_memo_pills", on_change=apply_memo_suggestion, label_visibility="collapsed")
     
-    if st.button("Register", type="primary"):
-        # Validation and Submission
-        final_dancer = dancer_val
-        if not final_dancer:
-             st.error("Dancer Name Required")
-        elif not new_video_url:
-            st.error("Video URL Required")
-        else:
-            if not new_img_url and new_video_url:
-                generated_thumb = get_thumbnail_url(new_video_url)
-                if generated_thumb: new_img_url = generated_thumb
+        if st.button("Register", type="primary"):
+            # Validation and Submission
+            final_dancer = dancer_val
+            if not final_dancer:
+                 st.error("Dancer Name Required")
+            elif not new_video_url:
+                st.error("Video URL Required")
+            else:
+                if not new_img_url and new_video_url:
+                    generated_thumb = get_thumbnail_url(new_video_url)
+                    if generated_thumb: new_img_url = generated_thumb
             
-            new_row = pd.DataFrame([{
-                "ダンサー": final_dancer,
-                "種目": new_discipline,
-                "画像URL": new_img_url,
-                "動画URL": new_video_url,
-                "メモ": new_memo
-            }])
-            try:
-                conn = st.connection("gsheets", type=GSheetsConnection)
-                conn.update(spreadsheet=SPREADSHEET_URL, data=pd.concat([df, new_row], ignore_index=True))
-                st.success(f"Registered: {final_dancer}")
-                st.cache_data.clear()
-                # Clear inputs
-                if "reg_dancer_keyup" in st.session_state: del st.session_state.reg_dancer_keyup
-                if "reg_memo_keyup" in st.session_state: del st.session_state.reg_memo_keyup
-                if "reg_dancer_pills" in st.session_state: del st.session_state.reg_dancer_pills
-                st.rerun()
-            except Exception as e:
-                st.error(f"Error: {e}")
+                new_row = {
+                    "ダンサー": final_dancer,
+                    "種目": new_discipline,
+                    "画像URL": new_img_url,
+                    "動画URL": new_video_url,
+                    "メモ": new_memo
+                }
+                try:
+                    # Send only the new row (no full-sheet rewrite)
+                    append_sheet_row(new_row)
+                    st.success(f"Registered: {final_dancer}")
+                    invalidate_data_cache()
+                    # Clear inputs
+                    if "reg_dancer_keyup" in st.session_state: del st.session_state.reg_dancer_keyup
+                    if "reg_memo_keyup" in st.session_state: del st.session_state.reg_memo_keyup
+                    if "reg_dancer_pills" in st.session_state: del st.session_state.reg_dancer_pills
+                    st.rerun(scope="app")
+                except Exception as e:
+                    st.error(f"Error: {e}")
+
+with st.sidebar:
+    registration_form(all_dancers, all_dancers_lower, sorted_vocab)
 
 # -----------------------------------------------------------------------------
 # Sorting Logic
@@ -674,17 +1180,6 @@ st.sidebar.markdown("---")
 #     st.cache_data.clear()
 #     st.rerun()
 
-# Order: W, T, F, Q, V, then others alphabetically (or just appended)
-priority_order = {'W': 0, 'T': 1, 'F': 2, 'Q': 3, 'V': 4}
-
-def get_sort_key(discipline):
-    d = str(discipline).strip()
-    return priority_order.get(d, 5), d
-
-# Create temporary columns for sorting
-filtered_df['sort_rank'] = filtered_df['種目'].apply(lambda x: get_sort_key(x)[0])
-filtered_df['sort_name'] = filtered_df['種目'].apply(lambda x: get_sort_key(x)[1])
-
 # Sorting logic moved to Tabs section
 # filtered_df = filtered_df.sort_values(...) -> handled in Tabs
 
@@ -728,7 +1223,6 @@ def edit_video_dialog(index, row_data):
                 if uploaded_file is not None:
                     with st.spinner("Uploading to Google Drive..."):
                         # Use a safe filename
-                        import datetime
                         timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
                         safe_name = f"manual_{timestamp}_{uploaded_file.name}"
                         drive_link = upload_image_to_drive(uploaded_file, safe_name, folder_id=drive_folder_input)
@@ -740,19 +1234,16 @@ def edit_video_dialog(index, row_data):
                             st.error("画像アップロードに失敗しました (Upload Failed)")
                             st.stop() # Stop update if upload failed
 
-                conn = st.connection("gsheets", type=GSheetsConnection)
-                curr_df = conn.read(spreadsheet=SPREADSHEET_URL)
-                
-                # Update the specific row
-                curr_df.at[index, 'ダンサー'] = e_dancer
-                curr_df.at[index, '種目'] = e_discipline
-                curr_df.at[index, '画像URL'] = final_img_url # Use final URL
-                curr_df.at[index, '動画URL'] = e_video_url
-                curr_df.at[index, 'メモ'] = e_memo
-                
-                conn.update(spreadsheet=SPREADSHEET_URL, data=curr_df)
+                # Update only the cells of the specific row
+                update_sheet_row(index, {
+                    'ダンサー': e_dancer,
+                    '種目': e_discipline,
+                    '画像URL': final_img_url, # Use final URL
+                    '動画URL': e_video_url,
+                    'メモ': e_memo
+                })
                 st.success("更新しました！ (Updated!)")
-                st.cache_data.clear()
+                invalidate_data_cache()
                 st.rerun()
             except Exception as e:
                 st.error(f"Error: {e}")
@@ -762,15 +1253,10 @@ def delete_video_dialog(index, title):
     st.warning(f"本当に削除しますか？ (Are you sure you want to delete form list?)\n\n**{title}**")
     if st.button("削除実行 (Delete)", type="primary"):
          try:
-            conn = st.connection("gsheets", type=GSheetsConnection)
-            curr_df = conn.read(spreadsheet=SPREADSHEET_URL)
-            
             # Drop the row
-            updated_df = curr_df.drop(index)
-            
-            conn.update(spreadsheet=SPREADSHEET_URL, data=updated_df)
+            delete_sheet_row(index)
             st.success("削除しました (Deleted)")
-            st.cache_data.clear()
+            invalidate_data_cache()
             st.rerun()
          except Exception as e:
             st.error(f"Error: {e}")
@@ -780,7 +1266,12 @@ def clear_filters():
     if "filter_dancer" in st.session_state: st.session_state["filter_dancer"] = []
     if "filter_discipline" in st.session_state: st.session_state["filter_discipline"] = []
     if "filter_search" in st.session_state: st.session_state["filter_search"] = []
-    st.cache_data.clear()
+    # The keyup box keeps its text client-side; a new key remounts it empty
+    gen = st.session_state.get("filter_search_query_gen", 0)
+    st.session_state.pop(f"filter_search_query_{gen}", None)
+    st.session_state["filter_search_query_gen"] = gen + 1
+    if "grid_pages" in st.session_state: st.session_state["grid_pages"] = {}
+    invalidate_data_cache()
 
 # -----------------------------------------------------------------------------
 # Main Content
@@ -793,19 +1284,6 @@ with col_reset:
     if st.button("Home / Reset", use_container_width=True, on_click=clear_filters):
         pass # The callback handles the logic, and the button click triggers a rerun automatically
 
-# Auto-thumbnail helper
-def get_thumbnail_url(video_url):
-    import re
-    if not video_url:
-        return ""
-    # Regex to capture the 11-char ID
-    regex = r'(?:v=|\/|be\/|embed\/)([0-9A-Za-z_-]{11})'
-    match = re.search(regex, video_url)
-    if match:
-        video_id = match.group(1)
-        return f"https://img.youtube.com/vi/{video_id}/hqdefault.jpg"
-    return ""
-
 # --- Registration Form (Interactive / No Form Wrapper for Autocomplete) ---
 
 
@@ -815,83 +1293,132 @@ st.markdown(f"Showing {len(filtered_df)} videos")
 # -----------------------------------------------------------------------------
 # Grid Renderer Function
 # -----------------------------------------------------------------------------
-def render_video_grid(df_subset):
+# Columns that feed the card, in build_card_html argument order (メモ/platform become display values)
+CARD_COLUMNS = ['ダンサー', '種目', '画像URL', '動画URL', 'メモ', 'platform']
+
+# Flattened Card HTML to prevent Markdown code block issues (styles live in the CSS block)
+CARD_TEMPLATE = (
+    '<a href="{video_url}" target="_blank" class="card-link"><div class="dance-card">'
+    '<div class="dance-thumb"><img src="{img_url}" alt="{dancer}" loading="lazy" decoding="async" fetchpriority="low" width="320" height="200"></div>'
+    '<div class="dance-card-content"><div class="dance-title">{dancer}</div>{memo_html}'
+    '<div class="dance-meta"><span>{discipline}</span><span class="badge platform-badge">{platform_name}</span></div>'
+    '</div></div></a>'
+)
+MEMO_TEMPLATE = '<div class="dance-memo">{memo}</div>'
+format_card = CARD_TEMPLATE.format
+
+def build_card_html(dancer, discipline, img_url, video_url, memo, platform_name):
+    """Builds the flattened card HTML for a single video row (fields already derived/escaped)."""
+    # Prepare memo HTML block conditionally (Flattened HTML)
+    memo_html = MEMO_TEMPLATE.format(memo=memo) if memo else ""
+
+    return format_card(
+        video_url=video_url,
+        img_url=img_url,
+        dancer=dancer,
+        memo_html=memo_html,
+        discipline=discipline,
+        platform_name=platform_name
+    )
+
+# cache_resource, not cache_data: the Series is only read, so every rerun can share the one
+# object instead of unpickling a fresh copy of all cards
+@st.cache_resource(ttl=600, max_entries=1)
+def compute_card_html(df_hash, _df):
+    """Precomputes the card HTML of every row; rebuilt only when the sheet data changes."""
+    # NaN handled once at frame level; bare tuples (name=None) avoid namedtuple attribute lookups
+    card_df = _df.reindex(columns=CARD_COLUMNS).astype(object).fillna("").astype(str)
+
+    # Extract Memo (vectorized, same line rules as str.splitlines)
+    # User request: "2nd line only". 
+    # Issue: User reported "Not displayed". Possibly data has only 1 line.
+    # Fix: Try 2nd line. If not available, fallback to 1st line (so something shows).
+    memo_lines = card_df['メモ'].str.replace(_TRAILING_LINE_BREAK_RE, "", regex=True).str.split(_LINE_BREAK_RE)
+    card_df['メモ'] = memo_lines.str[1].fillna(memo_lines.str[0]).fillna("").str.strip()
+
+    # Backfill missing thumbnails from the YouTube ID in one vectorized regex pass
+    # (display only: df keeps the sheet's own value, so edits never write the derived URL back)
+    has_img = card_df['画像URL'].str.strip() != ""
+    video_ids = card_df['動画URL'].str.extract(_YT_RE, expand=False)
+    card_df['画像URL'] = card_df['画像URL'].where(
+        has_img, ("https://img.youtube.com/vi/" + video_ids + "/hqdefault.jpg").fillna("")
+    )
+
+    # Serve Drive-hosted thumbnails at card size (rows stored before the resize still say w1000)
+    card_df['画像URL'] = card_df['画像URL'].str.replace(
+        _DRIVE_IMAGE_RE, rf"https://drive.google.com/thumbnail?id=\1&sz=w{DRIVE_THUMB_WIDTH}", regex=True
+    )
+
+    # Platform Name for Badge (Column C)
+    card_df['platform'] = card_df['platform'].where(card_df['platform'] != "", "YouTube")
+
+    # Escape sheet content once per column (text and href/src attributes alike)
+    for col in CARD_COLUMNS:
+        card_df[col] = card_df[col].map(html.escape)
+    return pd.Series(
+        [build_card_html(*fields) for fields in card_df.itertuples(index=False, name=None)],
+        index=_df.index,
+        dtype=object
+    )
+
+card_html_by_index = compute_card_html(df_hash, df)
+
+# Cards rendered per "page" of a grid; "Load more" extends it by another page
+GRID_PAGE_SIZE = 30
+
+def load_more_cards(page_key):
+    pages = st.session_state.setdefault("grid_pages", {})
+    pages[page_key] = pages.get(page_key, 1) + 1
+
+def render_video_grid(df_subset, page_key="grid"):
     if df_subset.empty:
         st.write("No videos found.")
         return
 
+    # Only build/ship the cards that are actually shown
+    total = len(df_subset)
+    limit = GRID_PAGE_SIZE * st.session_state.get("grid_pages", {}).get(page_key, 1)
+    df_subset = df_subset.iloc[:limit]
+
+    render_video_cards(df_subset)
+
+    if total > limit:
+        st.button(f"Load more ({total - limit})", key=f"more_{page_key}", on_click=load_more_cards, args=(page_key,))
+
+def render_video_cards(df_subset):
+    # Precomputed card HTML, looked up by original sheet index (every view keeps df's index labels)
+    subset_html = card_html_by_index.loc[df_subset.index]
+
+    # View-only: emit the whole grid as ONE markdown element (CSS grid keeps row order on mobile)
+    if not edit_mode:
+        cards_html = "".join(subset_html)
+        st.markdown(f'<div class="video-grid">{cards_html}</div>', unsafe_allow_html=True)
+        return
+
+    # Edit Mode: per-card elements so the Edit/Delete buttons can bind to each card
     # Batch into rows of 3 to ensure correct order on mobile (Row 0, then Row 1...)
     # Current Streamlit columns stack vertically on mobile (Col 0 all, then Col 1 all).
     # Breaking into rows prevents "jumping" numbers.
     
     N_COLS = 3
-    rows = [df_subset.iloc[i:i+N_COLS] for i in range(0, len(df_subset), N_COLS)]
-    
-    for row_chunk in rows:
-        cols = st.columns(N_COLS)
-        for i in range(len(row_chunk)):
-            row = row_chunk.iloc[i]
-            col = cols[i]
-            
-            # Use _original_index if present
-            if '_original_index' in df_subset.columns:
-                 original_idx = row['_original_index']
-            else:
-                 original_idx = row.name
+    cards = zip(subset_html.index, subset_html, df_subset['ダンサー'], df_subset['種目'])
     
-            dancer = row['ダンサー']
-            discipline = row['種目']
-            img_url = row['画像URL']
-            video_url = row['動画URL']
-        
-            # Robust access to Memo
-            try:
-                raw_memo = row.get('メモ', "")
-            except:
-                raw_memo = ""
-                
-            memo_full = str(raw_memo) if raw_memo is not None else ""
-            if memo_full.lower() == "nan": 
-                memo_full = ""
-            
-            # Extract Memo
-            # User request: "2nd line only". 
-            # Issue: User reported "Not displayed". Possibly data has only 1 line.
-            # Fix: Try 2nd line. If not available, fallback to 1st line (so something shows).
-            memo_lines = memo_full.splitlines()
-            if len(memo_lines) >= 2:
-                memo = memo_lines[1].strip()
-            elif len(memo_lines) == 1:
-                memo = memo_lines[0].strip()
-            else:
-                memo = "" 
-            
-            # Prepare memo HTML block conditionally (Flattened HTML)
-            memo_html = ""
-            if memo:
-                memo_html = f'<div style="font-size:0.8rem; color:#aaa; margin-bottom:4px; line-height:1.2; white-space: nowrap; overflow: hidden; text-overflow: ellipsis;">{memo}</div>'
+    # Single flat pass; open a new row of columns every N_COLS cards
+    for pos, (original_idx, card_html, dancer, discipline) in enumerate(cards):
+        if pos % N_COLS == 0:
+            cols = st.columns(N_COLS)
+
+        with cols[pos % N_COLS]:
+            st.markdown(card_html, unsafe_allow_html=True)
             
-            # Get Platform Name for Badge (Column C)
-            platform_name = row.get('platform', 'YouTube')
-            if not platform_name or str(platform_name).lower() == 'nan':
-                 platform_name = 'YouTube'
-
-            with col:
-                # Flattened Card HTML to prevent Markdown code block issues
-                card_html = f"""<a href="{video_url}" target="_blank" class="card-link"><div class="dance-card"><div style="width:100%; height:200px; overflow:hidden; position:relative;"><img src="{img_url}" alt="{dancer}" style="width:100%; height:100%; object-fit:cover;"></div><div class="dance-card-content"><div class="dance-title">{dancer}</div>{memo_html}<div class="dance-meta"><span>{discipline}</span><span class="badge" style="font-size:0.75rem; background:#CC0000; color=white;">{platform_name}</span></div></div></div></a>"""
-                
-                st.markdown(card_html, unsafe_allow_html=True)
-                
-                # Show buttons only if Edit Mode is ON
-                if edit_mode:
-                    # Using sub-columns might break layout if width is small, but let's try
-                    b_col1, b_col2 = st.columns(2)
-                    with b_col1:
-                        if st.button("✏️ 編集", key=f"edit_{original_idx}"):
-                            edit_video_dialog(original_idx, row.to_dict())
-                    with b_col2:
-                        if st.button("🗑️ 削除", key=f"del_{original_idx}"):
-                            delete_video_dialog(original_idx, f"{dancer} - {discipline}")
+            # Using sub-columns might break layout if width is small, but let's try
+            b_col1, b_col2 = st.columns(2)
+            with b_col1:
+                if st.button("✏️ 編集", key=f"edit_{original_idx}"):
+                    edit_video_dialog(original_idx, df.loc[original_idx].to_dict())
+            with b_col2:
+                if st.button("🗑️ 削除", key=f"del_{original_idx}"):
+                    delete_video_dialog(original_idx, f"{dancer} - {discipline}")
 
 # -----------------------------------------------------------------------------
 # Layout Logic based on Sort Mode
@@ -903,150 +1430,79 @@ def render_video_grid(df_subset):
 # Place Radio in Main Layout but style it fixed
 view_mode = st.radio("View Mode", ["Latest", "By Dancer", "By Dance"], horizontal=True, label_visibility="collapsed")
 
-# Custom CSS to Fix Position to Top-Left Header (Next to Toggle)
-st.markdown("""
-<style>
-    /* Position the Radio Container in the Header area */
-    div[data-testid="stRadio"] {
-        position: fixed !important;
-        top: 18px !important; /* Align with the sidebar toggle */
-        left: 70px !important; /* To the right of the toggle */
-        z-index: 1000000 !important;
-        width: auto !important;
-        background-color: transparent !important;
-        border: none !important;
-        padding: 0 !important;
-    }
-    
-    /* Horizontal layout */
-    div[role="radiogroup"] {
-        display: flex;
-        flex-direction: row;
-        gap: 15px;
-    }
-
-    /* Hide the default radio circle */
-    div[data-testid="stRadio"] label > div:first-child {
-        display: none;
-    }
-
-    /* Style the labels to look like text links */
-    div[data-testid="stRadio"] label {
-        background-color: transparent !important;
-        border: none !important;
-        color: #888 !important; /* Inactive color */
-        font-weight: 600;
-        cursor: pointer;
-        padding: 0 !important;
-        margin: 0 !important;
-        transition: color 0.2s;
-        font-size: 1rem;
-    }
-    
-    /* Hover state */
-    div[data-testid="stRadio"] label:hover {
-        color: #fff !important;
-    }
-
-    /* Selected State (Underline) */
-    div[data-testid="stRadio"] label:has(input:checked) {
-        border-bottom: 2px solid #FF8C00 !important;
-        color: white !important;
-    }
-    
-    /* Robust "Selected" styling is hard without stable classes. 
-       Let's just make them look good. 
-       We can assume the user knows which is active by the view.
-       But let's try to target the active one.
-       Usually the active radio has aria-checked="true" on the input.
-    */
-
-    /* Button Styles (Primary -> Orange) */
-    div.stButton > button[kind="primary"] {
-        background-color: #FF8C00 !important;
-        border-color: #FF8C00 !important;
-        color: white !important;
-    }
-    div.stButton > button[kind="primary"]:hover {
-        background-color: #E67E00 !important;
-        border-color: #E67E00 !important;
-    }
-
-    /* Footer */
-    .footer {
-        position: fixed;
-        left: 0;
-        bottom: 0;
-        width: 100%;
-        background-color: #0E1117;
-        color: #888;
-        text-align: center;
-        padding: 10px;
-        font-size: 0.8rem;
-        border-top: 1px solid #333;
-        z-index: 999;
-    }
-
-</style>
-""", unsafe_allow_html=True)
-
 # Helper for Gojyuon Sort (Define once)
+# Built lazily: pykakasi's dictionaries are only loaded when a kanji name needs a reading
 @st.cache_resource
 def get_kakasi():
+    import pykakasi
     kks = pykakasi.kakasi()
     return kks
 
-kks = get_kakasi()
-
+@functools.lru_cache(maxsize=8192)
 def get_yomi(text):
     if not text: return ""
-    result = kks.convert(text)
+    if _KANA_ONLY_RE.fullmatch(text):
+        return text.translate(_HIRA_TO_KATA)
+    result = get_kakasi().convert(text)
     return "".join([item['kana'] for item in result])
 
-if view_mode == "By Dancer":
-    # Sort by Dancer Name: Alphabet (English) First, then Gojyuon (Japanese)
-    import unicodedata
-    
-    # Helper for Yomi (Normalization)
-    def get_yomi_normalized(text):
-        if not text: return ""
-        # Normalize to half-width (NFKC) -> Strip whitespace
-        normalized = unicodedata.normalize('NFKC', str(text)).strip()
-        if not normalized: return ""
-        
-        # If it starts with Latin character, return lower case (ASCII < Kana)
-        # This naturally puts English first.
-        if 'a' <= normalized[0].lower() <= 'z':
-             return normalized.lower()
-        
-        # Else use kakasi for Gojyuon
-        return get_yomi(normalized)
-
-    # Add temporary columns for sorting
-    df_dancer_sorted = filtered_df.copy()
+# Helper for Yomi (Normalization)
+# Module-level and memoized, so reruns reuse the sort key of names already seen
+@functools.lru_cache(maxsize=4096)
+def get_yomi_normalized(text):
+    if not text: return ""
+    # Normalize to half-width (NFKC) -> Strip whitespace
+    # (NFKC leaves ASCII unchanged, so plain romaji names skip the normalization tables)
+    text = str(text)
+    normalized = (text if text.isascii() else unicodedata.normalize('NFKC', text)).strip()
+    if not normalized: return ""
     
+    # If it starts with Latin character, return lower case (ASCII < Kana)
+    # This naturally puts English first.
+    if 'a' <= normalized[0].lower() <= 'z':
+         return normalized.lower()
     
+    # Else use kakasi for Gojyuon
+    return get_yomi(normalized)
+
+# Section header for an initial. st.markdown rewrites a heading's id to a slug of its text,
+# so the slide index target (anchor-{item}) is a hidden div, as in the By Dance view
+ANCHOR_HEADER_TEMPLATE = (
+    "<div id='anchor-{initial}' style='position: relative; top: -80px; visibility: hidden;'></div>"
+    "<h2>{initial}</h2><hr>"
+)
+
+def group_by_initial(frame):
+    """Groups the frame's index labels by dancer initial, each group in reading order.
+    Returns (dancer_groups, sorted_initials)."""
+    # Reading key and initial, resolved once per distinct dancer and mapped back onto the rows
+    dancer_keys = {
+        dancer: (get_yomi_normalized(dancer), get_initial_from_text(dancer))
+        for dancer in frame['ダンサー'].dropna().unique()
+    }
+    yomi_keys = frame['ダンサー'].map({d: k[0] for d, k in dancer_keys.items()}).astype(object).fillna("").to_numpy()
+    initials = frame['ダンサー'].map({d: k[1] for d, k in dancer_keys.items()}).astype(object).fillna("#").to_numpy() # Blank names go under '#'
+
     # Group by Initial (By Dancer)
-    dancer_groups = {}
-    for idx, row in filtered_df.iterrows():
-        # Store original index for Edit/Delete actions
-        # We need to preserve the index from the main df
-        if '_original_index' in row:
-             row_data = row
-        else:
-             # If index not in column (normal case), row.name is the index
-             row_data = row.copy()
-             row_data['_original_index'] = idx
-             
-        dancer = row_data['ダンサー']
-        
-        initial = get_initial_from_text(dancer)
-            
-        if initial not in dancer_groups:
-            dancer_groups[initial] = []
-        dancer_groups[initial].append(row_data) # Append the Series
+    # Sort positions by reading (no frame copy / helper columns), then collect index labels per initial;
+    # each group is sliced from filtered_df once at render time
+    # (the original index is kept, so Edit/Delete actions still point at the main df rows)
+    order = np.argsort(yomi_keys, kind='stable')
+    dancer_groups = frame.index[order].groupby(initials[order])
+
+    # Letters first, the '#' (digits/symbols) bucket last, in one keyed sort
+    sorted_initials = sorted(dancer_groups.keys(), key=lambda c: (c == '#', c))
+    return dancer_groups, sorted_initials
+
+if view_mode == "By Dancer":
+    # Sort by Dancer Name: Alphabet (English) First, then Gojyuon (Japanese)
 
-    sorted_initials = sorted(dancer_groups.keys())
+    # Reuse this session's grouping while the data and filters are unchanged
+    groups_fp = (df_hash, tuple(selected_dancers), tuple(selected_disciplines), tuple(search_keywords))
+    if st.session_state.get("_dancer_groups_fp") != groups_fp:
+        st.session_state["_dancer_groups"] = group_by_initial(filtered_df)
+        st.session_state["_dancer_groups_fp"] = groups_fp
+    dancer_groups, sorted_initials = st.session_state["_dancer_groups"]
     
     # ==========================================
     # 5. ALPHABET INDEX
@@ -1055,13 +1511,14 @@ if view_mode == "By Dancer":
     render_slide_index(sorted_initials)
 
     # 3. Render content with Anchor Headers
+    # Header + divider as one precomputed element per initial (was st.header + st.markdown("---"))
+    header_html = {initial: ANCHOR_HEADER_TEMPLATE.format(initial=initial) for initial in sorted_initials}
     for initial in sorted_initials:
-        st.header(initial, anchor=f"anchor-{initial}")
-        st.markdown("---")
+        st.markdown(header_html[initial], unsafe_allow_html=True)
         
-        # Convert list of Series back to DataFrame for rendering
-        group_df = pd.DataFrame(dancer_groups[initial])
-        render_video_grid(group_df)
+        # Slice the group straight out of filtered_df (no per-row Series copies / frame rebuild)
+        group_df = filtered_df.loc[dancer_groups[initial]]
+        render_video_grid(group_df, page_key=f"dancer_{initial}")
 
 
 elif view_mode == "By Dance":
@@ -1075,6 +1532,14 @@ elif view_mode == "By Dance":
     
     # Remove Horizontal Nav in favor of Vertical
     
+    # Bucket rows once (non-main disciplines fall into "Other"), sorted by dancer for cleanliness
+    # The bucket is resolved per category, then partitioned in a single groupby on its codes
+    main_targets = targets[:-1]
+    bucket_of = {d: (d if d in main_targets else "Other") for d in filtered_df['種目'].cat.categories}
+    dance_key = filtered_df['種目'].map(bucket_of).astype(object).fillna("Other").astype(pd.CategoricalDtype(targets))
+    dance_groups = dict(tuple(filtered_df.sort_values(by=['ダンサー']).groupby(dance_key, sort=False, observed=True)))
+    empty_df = filtered_df.iloc[0:0]
+    
     for target in targets:
         # Invisible anchor matching the Index Bar expectation 'anchor-{char}'
         # Using relative positioning to offset sticky header if any, though standard works too
@@ -1082,15 +1547,9 @@ elif view_mode == "By Dance":
         
         st.header(target)
         
-        if target == "Other":
-            sub_df = filtered_df[~filtered_df['種目'].isin(["W", "T", "F", "Q", "V"])]
-        else:
-            sub_df = filtered_df[filtered_df['種目'] == target]
-        
-        # Sort sub_df by dancer for cleanliness
-        sub_df = sub_df.sort_values(by=['ダンサー'])
+        sub_df = dance_groups.get(target, empty_df)
         
-        render_video_grid(sub_df)
+        render_video_grid(sub_df, page_key=f"dance_{target}")
         st.markdown("---")
 
 
@@ -1104,13 +1563,10 @@ elif view_mode == "Latest":
     # (otherwise the index would jump randomly in a time-sorted list).
     
     # Reverse order: Show new items (bottom of sheet) first
+    # A reversed slice is a view, and it keeps the original index labels for the card lookup
     df_latest = filtered_df.iloc[::-1]
-    
-    # Store original index if not present
-    if '_original_index' not in df_latest.columns:
-        df_latest['_original_index'] = df_latest.index
         
-    render_video_grid(df_latest)
+    render_video_grid(df_latest, page_key="latest")
 
 # Spacer to ensure content isn't hidden behind fixed footer
 st.write("")
@@ -1121,7 +1577,7 @@ st.write("")
 col_ref1, col_ref2 = st.columns([4, 2])
 with col_ref2:
     if st.button("🔄 データ更新 / Reload", key="footer_reload", use_container_width=True):
-        st.cache_data.clear()
+        invalidate_data_cache()
         st.rerun()
 
 # Footer Component (Visible at bottom of main content)
@@ -1136,5 +1592,5 @@ st.sidebar.markdown("<br><br>", unsafe_allow_html=True)
 
 st.sidebar.markdown(f"**App Version:** `{APP_VERSION}`")
 if st.sidebar.button("🔄 Force Reload", key="sidebar_footer_reload"):
-    st.cache_data.clear()
+    invalidate_data_cache()
     st.rerun()
@@ -3,19 +3,17 @@ import ssl
 import urllib.request
 import sys
 
-# Apply the fix
-try:
-    _create_unverified_https_context = ssl._create_unverified_context
-except AttributeError:
-    pass
-else:
-    ssl._create_default_https_context = _create_unverified_https_context
+# Apply the fix (one unverified context, scoped to this opener instead of patched globally)
+ctx = ssl.create_default_context()
+ctx.check_hostname = False
+ctx.verify_mode = ssl.CERT_NONE
+opener = urllib.request.build_opener(urllib.request.HTTPSHandler(context=ctx))
 
 url = "https://docs.google.com/spreadsheets/d/1szdhHLrIHF_uMDjIOJokPGsxm_7BbvhiT9iKxrYxtH8/edit?usp=drive_link"
 
 print(f"Attempting to connect to {url}...")
 try:
-    resp = urllib.request.urlopen(url)
+    resp = opener.open(url)
     print(f"Success! Status: {resp.status}")
 except Exception as e:
     print(f"Failed: {e}")
@@ -0,0 +1,24 @@
+import io
+import pandas as pd
+
+# Same helper as app.py's label_sheet_rows (sheet row = positional label + 2)
+SHEET_ROW_INDEX_NAME = "sheet_row"
+
+def label_sheet_rows(data):
+    data = data.set_axis(pd.Index(data.index + 2, name=SHEET_ROW_INDEX_NAME), axis=0)
+    return data.dropna(how='all')
+
+# Sheet rows 2-5, with row 3 left blank
+csv = "ダンサー,種目\nAlice,W\n,\nBob,T\nCarol,F\n"
+expected = {"Alice": 2, "Bob": 4, "Carol": 5}
+
+# Public link: CSV export read with skip_blank_lines=False (blank row kept as NaN)
+csv_df = pd.read_csv(io.StringIO(csv), skip_blank_lines=False)
+# Service account: gspread_dataframe 4.x drops empty rows itself but keeps the labels
+gspread_df = pd.read_csv(io.StringIO(csv), skip_blank_lines=False).dropna(how='all')
+
+for name, frame in [("csv", csv_df), ("gspread", gspread_df)]:
+    labelled = label_sheet_rows(frame)
+    rows = dict(zip(labelled["ダンサー"], labelled.index))
+    print(f"{name} -> {rows}")
+    assert rows == expected, f"{name}: rows below the blank row are misnumbered"
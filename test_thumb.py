@@ -1,9 +1,10 @@
 import re
 
+# Current Regex (same pattern as app.py's _YT_RE, compiled once)
+_YT_RE = re.compile(r'(?:v=|\/|be\/|embed\/)([0-9A-Za-z_-]{11})')
+
 def get_thumbnail_url(video_url):
-    # Current Regex
-    regex = r"(?:v=|\/)([0-9A-Za-z_-]{11}).*"
-    match = re.search(regex, video_url)
+    match = _YT_RE.search(video_url)
     if match:
         video_id = match.group(1)
         return f"https://img.youtube.com/vi/{video_id}/hqdefault.jpg"